@@ -5,11 +5,54 @@ Uses TensorFlow's internal conversion utilities.
 
 import tensorflow as tf
 import os
-import json
+import sys
+import shutil
 import numpy as np
+import orjson
+from pathlib import Path
 
-def convert_model():
-    """Convert Keras model to TensorFlow.js Layers format."""
+# TensorFlow.js expects little-endian weights; only swap on big-endian hosts
+NATIVE_LITTLE_ENDIAN = sys.byteorder == "little"
+
+# Write buffer for weight files
+WEIGHT_BUFFER_SIZE = 1 << 20
+
+# Shard size used by tensorflowjs_converter (4 MB)
+SHARD_SIZE_BYTES = 4 * 1024 * 1024
+
+# Weight quantization modes (same as tensorflowjs_converter --quantize_float16/--quantize_uint8)
+QUANTIZATION_MODES = ["none", "float16", "uint8"]
+
+def quantize_weight(weight, quantization="none"):
+    """
+    Encode a weight tensor for the .bin shards.
+    
+    Returns the flat array to write and the manifest "quantization" entry
+    (None for plain float32). TensorFlow.js dequantizes back to float32 on load.
+    """
+    weight = np.ascontiguousarray(weight, dtype=np.float32).ravel()
+    
+    if quantization == "float16":
+        return weight.astype(np.float16), {"dtype": "float16"}
+    
+    if quantization == "uint8":
+        # Affine quantization with the range nudged so 0.0 is exactly representable
+        w_min = min(float(weight.min()), 0.0) if weight.size else 0.0
+        w_max = max(float(weight.max()), 0.0) if weight.size else 0.0
+        scale = (w_max - w_min) / 255.0 or 1.0
+        w_min = -round(-w_min / scale) * scale
+        q = np.clip(np.round((weight - w_min) / scale), 0, 255).astype(np.uint8)
+        return q, {"dtype": "uint8", "min": w_min, "scale": scale}
+    
+    return weight, None
+
+def convert_model(quantization="none"):
+    """
+    Convert Keras model to TensorFlow.js Layers format.
+    
+    Args:
+        quantization: Weight encoding, one of QUANTIZATION_MODES
+    """
     
     model_path = "model/keras_model.keras"
     output_dir = "model/tfjs_model"
@@ -28,8 +71,7 @@ def convert_model():
     
     # Use model.to_json() for proper Keras JSON format
     print("Extracting model architecture...")
-    model_json_str = model.to_json()
-    model_topology_raw = json.loads(model_json_str)
+    model_topology_raw = orjson.loads(model.to_json())
     
     # Clean up topology - remove fields that might cause issues
     model_topology = {
@@ -51,6 +93,14 @@ def convert_model():
                         # Remove batch dimension, keep the rest as inputShape
                         layer_config["inputShape"] = list(batch_shape[1:])
                     del layer_config["batch_shape"]
+            
+            # Models trained with a mixed precision policy run as plain float32 in the browser
+            layer_config = layer.get("config", {})
+            dtype = layer_config.get("dtype")
+            if isinstance(dtype, dict):
+                dtype = dtype.get("config", {}).get("name")
+            if isinstance(dtype, str) and dtype.startswith("mixed_"):
+                layer_config["dtype"] = "float32"
     
     # Remove build_config and compile_config if present (they can cause issues)
     if "build_config" in model_topology:
@@ -62,29 +112,20 @@ def convert_model():
     all_weights = model.get_weights()
     print(f"Found {len(all_weights)} weight arrays")
     
-    # Create output directory
-    if os.path.exists(output_dir):
-        import shutil
-        shutil.rmtree(output_dir)
-    os.makedirs(output_dir, exist_ok=True)
+    # Write into a staging directory; the existing model is only replaced once everything is written
+    tmp_dir = output_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
     
     # Create weights manifest - TensorFlow.js format
     # TensorFlow.js expects weightsManifest to be an array with "paths" and "weights" fields
-    weight_paths = []
     weight_info = []
     
-    weight_index = 0
-    layer_weight_index = 0
-    
     # Map weights to layer names
     for layer in model.layers:
         layer_weights = layer.get_weights()
         if len(layer_weights) > 0:
             for i, weight in enumerate(layer_weights):
-                weight_shape = list(weight.shape)
-                weight_name = f"group{weight_index}-shard1of1.bin"
-                weight_paths.append(weight_name)
-                
                 # Create proper weight name based on layer
                 if i == 0:
                     weight_name_tfjs = f"{layer.name}/kernel"
@@ -93,10 +134,24 @@ def convert_model():
                 
                 weight_info.append({
                     "name": weight_name_tfjs,
-                    "shape": weight_shape,
+                    "shape": weight.shape,
                     "dtype": "float32"
                 })
-                weight_index += 1
+    
+    # Encode each weight and concatenate into one little-endian buffer, in manifest order
+    encoded_weights = []
+    for info, weight in zip(weight_info, all_weights):
+        encoded, quant_info = quantize_weight(weight, quantization)
+        if quant_info is not None:
+            info["quantization"] = quant_info
+        if not NATIVE_LITTLE_ENDIAN:
+            encoded = encoded.byteswap()
+        encoded_weights.append(memoryview(encoded).cast("B"))
+    weights_bytes = memoryview(b"".join(encoded_weights))
+    
+    # Split into 4 MB shards; TensorFlow.js concatenates the paths in order on load
+    num_shards = max(1, -(-len(weights_bytes) // SHARD_SIZE_BYTES))
+    weight_paths = [f"group1-shard{i + 1}of{num_shards}.bin" for i in range(num_shards)]
     
     # Group weights into manifest entries (TensorFlow.js format)
     weights_manifest = [{
@@ -114,32 +169,47 @@ def convert_model():
     }
     
     # Save model.json
-    model_json_path = os.path.join(output_dir, "model.json")
-    with open(model_json_path, 'w') as f:
-        json.dump(model_json, f, indent=2)
-    print(f"✅ Created {model_json_path}")
+    Path(tmp_dir, "model.json").write_bytes(
+        orjson.dumps(model_json, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+    )
+    print(f"✅ Created {os.path.join(output_dir, 'model.json')}")
     
-    # Save weights as binary files (little-endian float32)
+    # Save weight shards as binary files
     print("Saving weights...")
-    weight_index = 0
-    for weight in all_weights:
-        weight_name = f"group{weight_index}-shard1of1.bin"
-        weight_path = os.path.join(output_dir, weight_name)
-        
-        # Convert to float32 and save as binary (little-endian)
-        weight_flat = weight.flatten().astype(np.float32)
-        # Ensure little-endian byte order
-        weight_flat.byteswap(False).tofile(weight_path)
-        
-        weight_index += 1
-    
-    print(f"✅ Saved {weight_index} weight files")
+    for shard_index, weight_name in enumerate(weight_paths):
+        weight_path = os.path.join(tmp_dir, weight_name)
+        start = shard_index * SHARD_SIZE_BYTES
+        with open(weight_path, 'wb', buffering=WEIGHT_BUFFER_SIZE) as f:
+            f.write(weights_bytes[start:start + SHARD_SIZE_BYTES])
+    
+    print(f"✅ Saved {len(weights_bytes)} bytes of weights in {num_shards} shard(s) (quantization: {quantization})")
+    
+    # Swap the new model in with renames, then delete the old one
+    old_dir = output_dir + ".old"
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if os.path.exists(output_dir):
+        os.replace(output_dir, old_dir)
+    os.replace(tmp_dir, output_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
     print(f"\n✅ Conversion complete! Model saved to {output_dir}/")
     
     return True
 
 if __name__ == "__main__":
-    success = convert_model()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Convert Keras model to TensorFlow.js format")
+    parser.add_argument(
+        "--quant",
+        type=str,
+        choices=QUANTIZATION_MODES,
+        default="none",
+        help="Quantize weights to shrink the .bin files (default: none)"
+    )
+    
+    args = parser.parse_args()
+    
+    success = convert_model(args.quant)
     if success:
         print("\n🎉 Model conversion successful!")
         print("Refresh your browser to load the model!")
@@ -4,16 +4,67 @@ Maps HaGRID gestures to our 4 classes: pointing, pinch, open_palm, idle
 """
 
 import os
-import json
+import hashlib
+import contextlib
 import cv2
 import mediapipe as mp
 import numpy as np
+import orjson
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from tqdm import tqdm
 from pathlib import Path
 
-# MediaPipe setup
-mp_hands = mp.solutions.hands
-mp_drawing = mp.solutions.drawing_utils
+# MediaPipe Tasks setup
+BaseOptions = mp.tasks.BaseOptions
+HandLandmarker = mp.tasks.vision.HandLandmarker
+HandLandmarkerOptions = mp.tasks.vision.HandLandmarkerOptions
+VisionRunningMode = mp.tasks.vision.RunningMode
+
+# Hand landmarker model bundle, download from:
+# https://storage.googleapis.com/mediapipe-models/hand_landmarker/hand_landmarker/float16/latest/hand_landmarker.task
+DEFAULT_MODEL_ASSET = "hand_landmarker.task"
+
+# Images handed to each worker process per round-trip
+CHUNK_SIZE = 32
+
+# Decode threads per worker process and how many decodes to keep in flight
+DECODE_THREADS = 4
+PREFETCH_DEPTH = 8
+
+# Write buffer for the streamed JSONL output
+OUTPUT_BUFFER_SIZE = 64 * 1024
+
+# 21 landmarks × 3 coords, stored as float32 rows in the .bin sidecar
+NUM_FEATURES = 63
+
+# Image file extensions to pick up (matched case-insensitively)
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png"}
+
+# posix_fadvise is only available on Linux and some other Unixes
+HAS_FADVISE = hasattr(os, "posix_fadvise")
+
+# Image decode flags - half resolution, MediaPipe resizes internally anyway
+DECODE_FLAGS = cv2.IMREAD_REDUCED_COLOR_2
+
+# HandLandmarker detection threshold
+MIN_DETECTION_CONFIDENCE = 0.5
+
+# Chunks submitted to the worker pool ahead of the one being consumed
+MAX_PENDING_CHUNKS = 2 * (os.cpu_count() or 1)
+
+# Landmark cache: append-only file of (BLAKE2b digest of the image bytes keyed by
+# the model bundle and extraction settings, features) records; NaN features mean
+# no hand was detected in that image.
+DEFAULT_CACHE_FILE = ".landmark_cache.bin"
+CACHE_KEY_SIZE = 16
+CACHE_RECORD = np.dtype([("key", f"V{CACHE_KEY_SIZE}"), ("features", "<f4", (NUM_FEATURES,))])
+NO_HAND = np.full(NUM_FEATURES, np.nan, dtype=np.float32)
+
+# Per-process state, set up by _init_worker and lazily by the _get_* helpers
+_model_asset_path = DEFAULT_MODEL_ASSET
+_landmarker = None
+_io_pool = None
 
 # Gesture mapping from HaGRID to our classes
 # HaGRID has 18 gestures - we'll map relevant ones to our 4 classes
@@ -45,48 +96,262 @@ GESTURE_MAPPING = {
     "no_gesture": "idle",
 }
 
-def extract_landmarks(image_path, hands_model):
-    """Extract MediaPipe hand landmarks from an image."""
-    image = cv2.imread(str(image_path))
+def _init_worker(model_asset_path):
+    """Process pool initializer: remember which model bundle to load."""
+    global _model_asset_path, _io_pool
+    _model_asset_path = model_asset_path
+    # A forked worker inherits the parent's hashing pool but none of its threads
+    _io_pool = None
+
+def _get_landmarker():
+    """Return this process's HandLandmarker, creating it on first use."""
+    global _landmarker
+    if _landmarker is None:
+        options = HandLandmarkerOptions(
+            base_options=BaseOptions(model_asset_path=_model_asset_path),
+            running_mode=VisionRunningMode.IMAGE,
+            num_hands=1,
+            # Tracking/presence thresholds only apply to VIDEO and LIVE_STREAM modes
+            min_hand_detection_confidence=MIN_DETECTION_CONFIDENCE
+        )
+        _landmarker = HandLandmarker.create_from_options(options)
+    return _landmarker
+
+def _get_io_pool():
+    """Return this process's file read/decode thread pool, creating it on first use."""
+    global _io_pool
+    if _io_pool is None:
+        _io_pool = ThreadPoolExecutor(max_workers=DECODE_THREADS)
+    return _io_pool
+
+def read_image_bytes(image_path):
+    """Read a whole image file, or return None if it can't be read."""
+    try:
+        with open(image_path, 'rb') as f:
+            # Ask the kernel for aggressive readahead; the whole file is read at once
+            if HAS_FADVISE:
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            return f.read()
+    except OSError:
+        return None
+
+def decode_image(data):
+    """Decode encoded image bytes to an RGB array, or None if they can't be decoded."""
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), DECODE_FLAGS)
     if image is None:
         return None
     
-    # Convert BGR to RGB
-    image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-    
-    # Process with MediaPipe
-    results = hands_model.process(image_rgb)
-    
-    if results.multi_hand_landmarks and len(results.multi_hand_landmarks) > 0:
-        # Use first detected hand
-        landmarks = results.multi_hand_landmarks[0]
-        
-        # Extract normalized coordinates
-        landmark_data = []
-        features = []
-        for landmark in landmarks.landmark:
-            landmark_data.append({
-                "x": landmark.x,
-                "y": landmark.y,
-                "z": landmark.z
-            })
-            features.extend([landmark.x, landmark.y, landmark.z])
-        
-        return {
-            "landmarks": landmark_data,
-            "features": features  # 63 features (21 landmarks × 3 coords)
-        }
+    # Convert BGR to RGB in place, no second full-size buffer
+    cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=image)
+    return image
+
+def load_image(image_path):
+    """Read and decode an image file to RGB, or None if it can't be read or decoded."""
+    data = read_image_bytes(image_path)
+    return None if data is None else decode_image(data)
+
+def hash_image(image_path, cache_salt):
+    """Landmark cache key for an image file, or None if it can't be read."""
+    data = read_image_bytes(image_path)
+    if data is None:
+        return None
+    return hashlib.blake2b(data, digest_size=CACHE_KEY_SIZE, key=cache_salt).digest()
+
+def landmark_cache_salt(model_asset_path):
+    """
+    Digest of everything besides the image that determines the landmarks.
+    
+    Used as the BLAKE2b key for cache lookups, so changing the model bundle,
+    decode scale or detection threshold never reuses stale results.
+    """
+    h = hashlib.blake2b(digest_size=32)
+    with open(model_asset_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    h.update(f"decode={DECODE_FLAGS};min_detection={MIN_DETECTION_CONFIDENCE};num_hands=1".encode())
+    return h.digest()
+
+def detect_landmarks(image):
+    """
+    Run MediaPipe on an RGB image (runs in a worker process).
+    
+    Returns a float32 array of 63 features (21 landmarks × x, y, z), or None
+    if no hand was detected.
+    """
+    mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=image)
+    results = _get_landmarker().detect(mp_image)
+    
+    if results.hand_landmarks:
+        # Use first detected hand, normalized coordinates copied in one pass
+        landmarks = results.hand_landmarks[0]
+        return np.fromiter(
+            (v for lm in landmarks for v in (lm.x, lm.y, lm.z)),
+            dtype=np.float32,
+            count=NUM_FEATURES
+        )
     
     return None
 
-def process_haGRID_dataset(dataset_root, output_file="gesture-data-haGRID.json", max_samples_per_class=500):
+def extract_landmarks_batch(image_paths):
+    """
+    Extract landmarks for a batch of image files (runs in a worker process).
+    
+    Images are read and decoded ahead on a thread pool (cv2 releases the
+    GIL) while the landmarker works through them in order. Returns the
+    features (or None) for each path.
+    """
+    pool = _get_io_pool()
+    paths = iter(image_paths)
+    pending = deque(pool.submit(load_image, path) for _, path in zip(range(PREFETCH_DEPTH), paths))
+    
+    results = []
+    while pending:
+        image = pending.popleft().result()
+        next_path = next(paths, None)
+        if next_path is not None:
+            pending.append(pool.submit(load_image, next_path))
+        results.append(None if image is None else detect_landmarks(image))
+    return results
+
+def _submit_chunk(executor, chunk, landmark_cache, cache_salt):
+    """Look a chunk up in the landmark cache and send only the misses to the worker pool."""
+    if landmark_cache is None:
+        return [None] * len(chunk), [True] * len(chunk), executor.submit(extract_landmarks_batch, chunk)
+    
+    # Hash on threads in this process (hashlib releases the GIL); workers never see the cache
+    keys = list(_get_io_pool().map(hash_image, chunk, [cache_salt] * len(chunk)))
+    is_miss = [key is not None and key not in landmark_cache for key in keys]
+    misses = [path for path, miss in zip(chunk, is_miss) if miss]
+    future = executor.submit(extract_landmarks_batch, misses) if misses else None
+    return keys, is_miss, future
+
+def _collect_chunk(submitted, landmark_cache, cache_out):
+    """Yield a submitted chunk's features in order, recording new results in the cache."""
+    keys, is_miss, future = submitted
+    new_results = iter(future.result() if future is not None else ())
+    for key, miss in zip(keys, is_miss):
+        if miss:
+            features = next(new_results)
+            if landmark_cache is not None:
+                row = NO_HAND if features is None else features
+                landmark_cache[key] = row
+                if cache_out is not None:
+                    cache_out.write(key)
+                    cache_out.write(row.astype("<f4", copy=False).tobytes())
+            yield features
+        elif key is None:
+            yield None
+        else:
+            cached = landmark_cache[key]
+            yield None if np.isnan(cached[0]) else cached
+
+def map_landmarks(executor, image_files, landmark_cache=None, cache_salt=None, cache_out=None):
+    """
+    Yield the features (or None) for each of image_files, in order.
+    
+    Cache hits are answered in this process; misses are run through
+    extract_landmarks_batch in the worker pool, at most MAX_PENDING_CHUNKS
+    chunks ahead, and appended to cache_out (an open landmark cache file).
+    landmark_cache=None disables the cache.
+    """
+    chunks = (image_files[i:i + CHUNK_SIZE] for i in range(0, len(image_files), CHUNK_SIZE))
+    pending = deque()
+    try:
+        for chunk in chunks:
+            pending.append(_submit_chunk(executor, chunk, landmark_cache, cache_salt))
+            if len(pending) >= MAX_PENDING_CHUNKS:
+                yield from _collect_chunk(pending.popleft(), landmark_cache, cache_out)
+        while pending:
+            yield from _collect_chunk(pending.popleft(), landmark_cache, cache_out)
+    finally:
+        # Cancel chunks that haven't started yet if the caller stops early
+        for _, _, future in pending:
+            if future is not None:
+                future.cancel()
+
+def load_landmark_cache(cache_file):
+    """Load the landmark cache into a {key: features} dict (None if disabled)."""
+    if not cache_file:
+        return None
+    if not os.path.exists(cache_file):
+        return {}
+    
+    # Ignore a partial trailing record left by an interrupted run
+    count = os.path.getsize(cache_file) // CACHE_RECORD.itemsize
+    records = np.fromfile(cache_file, dtype=CACHE_RECORD, count=count)
+    print(f"Loaded {len(records)} cached results from {cache_file}")
+    return dict(zip((key.tobytes() for key in records["key"]), records["features"]))
+
+def open_landmark_cache(cache_file):
+    """Open the landmark cache for appending new results (no-op context if disabled)."""
+    if not cache_file:
+        return contextlib.nullcontext()
+    
+    # Drop a partial trailing record so new records stay aligned
+    if os.path.exists(cache_file):
+        size = os.path.getsize(cache_file)
+        if size % CACHE_RECORD.itemsize:
+            os.truncate(cache_file, size - size % CACHE_RECORD.itemsize)
+    return open(cache_file, 'ab', buffering=OUTPUT_BUFFER_SIZE)
+
+def iter_images(root, recursive=True):
+    """Yield paths of image files under root with a single directory walk."""
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        stack.append(entry.path)
+                elif os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS:
+                    yield entry.path
+
+def features_path_for(output_file):
+    """Path of the float32 feature sidecar that goes with a JSONL index file."""
+    return os.path.splitext(output_file)[0] + ".bin"
+
+def commit_output(output_file, features):
+    """
+    Write the feature sidecar and move it and the streamed index into place.
+    
+    The index is streamed to output_file + ".tmp"; both files only replace
+    the previous run's output once the run has finished, so an interrupted
+    run never leaves a new index next to stale features.
+    """
+    features_file = features_path_for(output_file)
+    features.tofile(features_file + ".tmp")
+    os.replace(features_file + ".tmp", features_file)
+    os.replace(output_file + ".tmp", output_file)
+    return features_file
+
+def create_executor(model_asset_path=DEFAULT_MODEL_ASSET):
+    """Create a process pool with one HandLandmarker per worker."""
+    if not os.path.exists(model_asset_path):
+        print(f"Error: MediaPipe model '{model_asset_path}' not found!")
+        print("\nPlease download hand_landmarker.task from:")
+        print("https://storage.googleapis.com/mediapipe-models/hand_landmarker/hand_landmarker/float16/latest/hand_landmarker.task")
+        return None
+    
+    return ProcessPoolExecutor(
+        max_workers=os.cpu_count(),
+        initializer=_init_worker,
+        initargs=(model_asset_path,)
+    )
+
+def process_haGRID_dataset(dataset_root, output_file="gesture-data-haGRID.jsonl", max_samples_per_class=500,
+                           model_asset_path=DEFAULT_MODEL_ASSET, keep_paths=False,
+                           cache_file=DEFAULT_CACHE_FILE):
     """
     Process HaGRID dataset.
     
     Args:
         dataset_root: Path to HaGRID dataset root directory
-        output_file: Output JSON file path
+        output_file: Output JSONL index path (one sample per line); features are
+            written as a float32 [N, 63] array to the matching .bin file
         max_samples_per_class: Maximum samples to extract per gesture class
+        model_asset_path: Path to MediaPipe hand_landmarker.task bundle
+        keep_paths: Also store source, original gesture and image path per sample
+        cache_file: Landmark cache file reused across runs (None to disable)
     """
     dataset_path = Path(dataset_root)
     
@@ -97,17 +362,17 @@ def process_haGRID_dataset(dataset_root, output_file="gesture-data-haGRID.json",
         print("https://github.com/hukenovs/hagrid")
         return
     
-    # Initialize MediaPipe Hands
-    print("Initializing MediaPipe Hands...")
-    hands = mp_hands.Hands(
-        static_image_mode=True,
-        max_num_hands=1,
-        min_detection_confidence=0.5,
-        min_tracking_confidence=0.5
-    )
+    # Initialize MediaPipe worker pool
+    print(f"Initializing MediaPipe HandLandmarker on {os.cpu_count()} workers...")
+    executor = create_executor(model_asset_path)
+    if executor is None:
+        return
+    landmark_cache = load_landmark_cache(cache_file)
+    cache_salt = landmark_cache_salt(model_asset_path) if landmark_cache is not None else None
     
-    collected_data = []
     class_counts = {"pointing": 0, "pinch": 0, "open_palm": 0, "idle": 0}
+    features_buf = np.empty((max_samples_per_class * len(class_counts), NUM_FEATURES), dtype=np.float32)
+    num_samples = 0
     
     # HaGRID structure: dataset_root/gesture_name/images/
     gesture_dirs = [d for d in dataset_path.iterdir() if d.is_dir()]
@@ -115,56 +380,59 @@ def process_haGRID_dataset(dataset_root, output_file="gesture-data-haGRID.json",
     print(f"\nFound {len(gesture_dirs)} gesture directories")
     print("Processing images...\n")
     
-    for gesture_dir in tqdm(gesture_dirs, desc="Processing gestures"):
-        gesture_name = gesture_dir.name
-        
-        # Map HaGRID gesture to our class
-        our_class = GESTURE_MAPPING.get(gesture_name, "idle")
-        
-        # Skip if we already have enough samples for this class
-        if class_counts[our_class] >= max_samples_per_class:
-            continue
-        
-        # Find images in this gesture directory
-        image_extensions = ['.jpg', '.jpeg', '.png']
-        image_files = []
-        for ext in image_extensions:
-            image_files.extend(list(gesture_dir.glob(f"**/*{ext}")))
-            image_files.extend(list(gesture_dir.glob(f"**/*{ext.upper()}")))
-        
-        # Process images
-        for img_path in tqdm(image_files, desc=f"  {gesture_name}", leave=False):
+    # Stream samples to disk as they complete instead of holding them all in memory
+    with open(output_file + ".tmp", 'wb', buffering=OUTPUT_BUFFER_SIZE) as f, open_landmark_cache(cache_file) as cache_out:
+        for gesture_dir in tqdm(gesture_dirs, desc="Processing gestures"):
+            gesture_name = gesture_dir.name
+            
+            # Map HaGRID gesture to our class
+            our_class = GESTURE_MAPPING.get(gesture_name, "idle")
+            
+            # Skip if we already have enough samples for this class
             if class_counts[our_class] >= max_samples_per_class:
-                break
+                continue
             
-            landmark_data = extract_landmarks(img_path, hands)
+            # Find images in this gesture directory
+            image_files = list(iter_images(gesture_dir))
             
-            if landmark_data:
-                collected_data.append({
-                    "label": our_class,
-                    "landmarks": landmark_data["landmarks"],
-                    "features": landmark_data["features"],
-                    "source": "haGRID",
-                    "original_gesture": gesture_name,
-                    "image_path": str(img_path)
-                })
-                class_counts[our_class] += 1
-    
-    # Close MediaPipe
-    hands.close()
-    
-    # Save results
-    print(f"\n\nCollected {len(collected_data)} samples:")
+            # Process images in parallel, results come back in order
+            remaining = max_samples_per_class - class_counts[our_class]
+            results = map_landmarks(executor, image_files, landmark_cache, cache_salt, cache_out)
+            for img_path, features in tqdm(zip(image_files, results), total=len(image_files),
+                                           desc=f"  {gesture_name}", leave=False):
+                if features is None:
+                    continue
+                
+                features_buf[num_samples] = features
+                sample = {"label": our_class}
+                if keep_paths:
+                    sample.update(source="haGRID", original_gesture=gesture_name, image_path=img_path)
+                f.write(orjson.dumps(sample, option=orjson.OPT_APPEND_NEWLINE))
+                num_samples += 1
+                remaining -= 1
+                if remaining == 0:
+                    break
+            
+            # Stop the pool working on this directory before walking the next one
+            results.close()
+            class_counts[our_class] = max_samples_per_class - remaining
+    
+    # Shut down workers (and their HandLandmarkers)
+    executor.shutdown(cancel_futures=True)
+    
+    features_file = commit_output(output_file, features_buf[:num_samples])
+    
+    # Summary
+    print(f"\n\nCollected {num_samples} samples:")
     for class_name, count in class_counts.items():
         print(f"  {class_name}: {count}")
     
-    with open(output_file, 'w') as f:
-        json.dump(collected_data, f, indent=2)
-    
-    print(f"\n✅ Saved to {output_file}")
+    print(f"\n✅ Saved to {output_file} (features: {features_file})")
     print(f"\nYou can now use this file to train your model!")
 
-def process_custom_dataset(image_dir, label, output_file="gesture-data-custom.json"):
+def process_custom_dataset(image_dir, label, output_file="gesture-data-custom.jsonl",
+                           model_asset_path=DEFAULT_MODEL_ASSET, keep_paths=False,
+                           cache_file=DEFAULT_CACHE_FILE):
     """
     Process a custom directory of images with a single label.
     Useful for processing your own collected images.
@@ -172,7 +440,11 @@ def process_custom_dataset(image_dir, label, output_file="gesture-data-custom.js
     Args:
         image_dir: Directory containing images
         label: Label for all images (e.g., "pointing", "pinch", etc.)
-        output_file: Output JSON file path
+        output_file: Output JSONL index path (one sample per line); features are
+            written as a float32 [N, 63] array to the matching .bin file
+        model_asset_path: Path to MediaPipe hand_landmarker.task bundle
+        keep_paths: Also store source and image path per sample
+        cache_file: Landmark cache file reused across runs (None to disable)
     """
     image_path = Path(image_dir)
     
@@ -180,47 +452,40 @@ def process_custom_dataset(image_dir, label, output_file="gesture-data-custom.js
         print(f"Error: Directory '{image_dir}' does not exist!")
         return
     
-    # Initialize MediaPipe Hands
-    print("Initializing MediaPipe Hands...")
-    hands = mp_hands.Hands(
-        static_image_mode=True,
-        max_num_hands=1,
-        min_detection_confidence=0.5,
-        min_tracking_confidence=0.5
-    )
-    
-    collected_data = []
+    # Initialize MediaPipe worker pool
+    print(f"Initializing MediaPipe HandLandmarker on {os.cpu_count()} workers...")
+    executor = create_executor(model_asset_path)
+    if executor is None:
+        return
+    landmark_cache = load_landmark_cache(cache_file)
+    cache_salt = landmark_cache_salt(model_asset_path) if landmark_cache is not None else None
     
     # Find all images
-    image_extensions = ['.jpg', '.jpeg', '.png']
-    image_files = []
-    for ext in image_extensions:
-        image_files.extend(list(image_path.glob(f"*{ext}")))
-        image_files.extend(list(image_path.glob(f"*{ext.upper()}")))
+    image_files = list(iter_images(image_path, recursive=False))
     
     print(f"Found {len(image_files)} images")
     print("Processing...\n")
     
-    for img_path in tqdm(image_files):
-        landmark_data = extract_landmarks(img_path, hands)
-        
-        if landmark_data:
-            collected_data.append({
-                "label": label,
-                "landmarks": landmark_data["landmarks"],
-                "features": landmark_data["features"],
-                "source": "custom",
-                "image_path": str(img_path)
-            })
+    features_buf = np.empty((len(image_files), NUM_FEATURES), dtype=np.float32)
+    num_samples = 0
     
-    hands.close()
+    with open(output_file + ".tmp", 'wb', buffering=OUTPUT_BUFFER_SIZE) as f, open_landmark_cache(cache_file) as cache_out:
+        results = map_landmarks(executor, image_files, landmark_cache, cache_salt, cache_out)
+        for img_path, features in tqdm(zip(image_files, results), total=len(image_files)):
+            if features is not None:
+                features_buf[num_samples] = features
+                sample = {"label": label}
+                if keep_paths:
+                    sample.update(source="custom", image_path=img_path)
+                f.write(orjson.dumps(sample, option=orjson.OPT_APPEND_NEWLINE))
+                num_samples += 1
     
-    print(f"\n✅ Collected {len(collected_data)} samples")
+    executor.shutdown()
     
-    with open(output_file, 'w') as f:
-        json.dump(collected_data, f, indent=2)
+    features_file = commit_output(output_file, features_buf[:num_samples])
     
-    print(f"✅ Saved to {output_file}")
+    print(f"\n✅ Collected {num_samples} samples")
+    print(f"✅ Saved to {output_file} (features: {features_file})")
 
 if __name__ == "__main__":
     import argparse
@@ -248,8 +513,8 @@ if __name__ == "__main__":
     parser.add_argument(
         "--output",
         type=str,
-        default="gesture-data-processed.json",
-        help="Output JSON file path"
+        default="gesture-data-processed.jsonl",
+        help="Output JSONL file path"
     )
     parser.add_argument(
         "--max-samples",
@@ -257,21 +522,45 @@ if __name__ == "__main__":
         default=500,
         help="Maximum samples per class for HaGRID (default: 500)"
     )
+    parser.add_argument(
+        "--model-asset",
+        type=str,
+        default=DEFAULT_MODEL_ASSET,
+        help=f"Path to MediaPipe hand landmarker bundle (default: {DEFAULT_MODEL_ASSET})"
+    )
+    parser.add_argument(
+        "--keep-paths",
+        action="store_true",
+        help="Store source/image path per sample for dataset inspection"
+    )
+    parser.add_argument(
+        "--cache",
+        type=str,
+        default=DEFAULT_CACHE_FILE,
+        help=f"Landmark cache file keyed by image content, reused across runs (default: {DEFAULT_CACHE_FILE})"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Don't read or write the landmark cache"
+    )
     
     args = parser.parse_args()
+    cache_file = None if args.no_cache else args.cache
     
     if args.custom:
         if not args.label:
             print("Error: --label is required when using --custom")
             exit(1)
-        process_custom_dataset(args.custom, args.label, args.output)
+        process_custom_dataset(args.custom, args.label, args.output, args.model_asset, args.keep_paths, cache_file)
     elif args.dataset:
-        process_haGRID_dataset(args.dataset, args.output, args.max_samples)
+        process_haGRID_dataset(args.dataset, args.output, args.max_samples, args.model_asset, args.keep_paths,
+                               cache_file)
     else:
         print("Please specify either --dataset (for HaGRID) or --custom (for custom images)")
         print("\nExamples:")
         print("  # Process HaGRID dataset:")
-        print("  python process_dataset.py --dataset /path/to/hagrid --output gesture-data.json")
+        print("  python process_dataset.py --dataset /path/to/hagrid --output gesture-data.jsonl")
         print("\n  # Process custom images:")
-        print("  python process_dataset.py --custom /path/to/images --label pointing --output pointing-data.json")
+        print("  python process_dataset.py --custom /path/to/images --label pointing --output pointing-data.jsonl")
 
@@ -5,6 +5,7 @@ Converts MediaPipe hand landmarks to gesture classes: pointing, pinch, open_palm
 
 import json
 import numpy as np
+import orjson
 import tensorflow as tf
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import LabelEncoder
@@ -14,76 +15,149 @@ import os
 np.random.seed(42)
 tf.random.set_seed(42)
 
+# 21 landmarks × 3 coords
+NUM_FEATURES = 63
+
+# Gesture classes in label index order (matches model/label_mapping.json)
+CLASSES = ['idle', 'open_palm', 'pinch', 'pointing']
+CLASS_TO_INDEX = {label: i for i, label in enumerate(CLASSES)}
+
+# Keras dtype policies accepted by --precision
+PRECISION_POLICIES = ["float32", "mixed_bfloat16", "mixed_float16"]
+
+# Training backends accepted by --backend
+BACKENDS = ["keras", "numba"]
+
+def iter_samples(json_file):
+    """
+    Yield samples from a gesture data file.
+    
+    Accepts both a JSON array (data collector export) and newline-delimited
+    JSON (process_dataset.py output), which is read line by line.
+    """
+    with open(json_file, 'rb') as f:
+        first_line = f.readline()
+        if first_line.lstrip().startswith(b'['):
+            yield from orjson.loads(first_line + f.read())
+            return
+        
+        if first_line.strip():
+            yield orjson.loads(first_line)
+        for line in f:
+            if line.strip():
+                yield orjson.loads(line)
+
 def load_data(json_file):
-    """Load gesture data from JSON file."""
-    with open(json_file, 'r') as f:
-        data = json.load(f)
+    """
+    Load gesture data from JSON or JSONL file.
+    
+    If a float32 feature sidecar (same name, .bin extension) written by
+    process_dataset.py sits next to the file, features are read from it and
+    the JSONL only supplies labels.
+    """
+    features_file = os.path.splitext(json_file)[0] + '.bin'
+    if os.path.exists(features_file):
+        X = np.fromfile(features_file, dtype=np.float32).reshape(-1, NUM_FEATURES)
+        y = np.array([sample['label'] for sample in iter_samples(json_file)])
+        if len(X) != len(y):
+            raise ValueError(
+                f"{features_file} has {len(X)} feature rows but {json_file} has {len(y)} labels"
+            )
+        print(f"Loaded {len(X)} samples (features from {features_file})")
+        print_class_distribution(y)
+        return X, y
     
-    print(f"Loaded {len(data)} samples")
+    data = list(iter_samples(json_file))
     
-    # Extract features and labels
-    X = []
-    y = []
+    # Fill one preallocated (N, 63) buffer; the (N, 21, 3) view is for the landmarks fallback
+    X = np.empty((len(data), NUM_FEATURES), dtype=np.float32)
+    X_landmarks = X.reshape(len(data), NUM_FEATURES // 3, 3)
+    y = np.array([sample['label'] for sample in data])
     
-    for sample in data:
+    for i, sample in enumerate(data):
         # Use the features array (63 features: 21 landmarks × 3 coords)
-        if 'features' in sample:
-            X.append(sample['features'])
+        features = sample.get('features')
+        if features is not None:
+            X[i] = features
         else:
             # Fallback: extract from landmarks
-            features = []
-            for landmark in sample['landmarks']:
-                features.extend([landmark['x'], landmark['y'], landmark['z']])
-            X.append(features)
-        
-        y.append(sample['label'])
+            X_landmarks[i] = [(lm['x'], lm['y'], lm['z']) for lm in sample['landmarks']]
     
-    X = np.array(X, dtype=np.float32)
-    y = np.array(y)
+    print(f"Loaded {len(X)} samples")
+    print_class_distribution(y)
     
-    # Print class distribution
+    return X, y
+
+def print_class_distribution(y):
+    """Print how many samples each label has."""
     unique, counts = np.unique(y, return_counts=True)
     print("\nClass distribution:")
     for label, count in zip(unique, counts):
         print(f"  {label}: {count}")
-    
-    return X, y
 
-def create_model(input_dim, num_classes):
-    """Create a simple neural network model."""
-    model = tf.keras.Sequential([
-        tf.keras.layers.Dense(128, activation='relu', input_shape=(input_dim,)),
-        tf.keras.layers.Dropout(0.3),
-        tf.keras.layers.Dense(64, activation='relu'),
-        tf.keras.layers.Dropout(0.3),
-        tf.keras.layers.Dense(32, activation='relu'),
-        tf.keras.layers.Dense(num_classes, activation='softmax')
-    ])
+def create_model(input_dim, num_classes, precision='float32'):
+    """
+    Create a simple neural network model.
+    
+    With a mixed precision policy the dense layers compute in 16 bits while
+    the final softmax (and so the loss) stays in float32.
+    """
+    # Layers pick up the global policy when built; restore the caller's policy afterwards
+    previous_policy = tf.keras.mixed_precision.global_policy()
+    tf.keras.mixed_precision.set_global_policy(precision)
+    try:
+        model = tf.keras.Sequential([
+            tf.keras.layers.Dense(128, activation='relu', input_shape=(input_dim,)),
+            tf.keras.layers.Dropout(0.3),
+            tf.keras.layers.Dense(64, activation='relu'),
+            tf.keras.layers.Dropout(0.3),
+            tf.keras.layers.Dense(32, activation='relu'),
+            tf.keras.layers.Dense(num_classes),
+            tf.keras.layers.Activation('softmax', dtype='float32')
+        ])
+    finally:
+        tf.keras.mixed_precision.set_global_policy(previous_policy)
+    
+    optimizer = tf.keras.optimizers.Adam()
+    if precision == 'mixed_float16':
+        # float16 gradients need loss scaling to avoid underflow (bfloat16 does not)
+        optimizer = tf.keras.mixed_precision.LossScaleOptimizer(optimizer)
     
     model.compile(
-        optimizer='adam',
+        optimizer=optimizer,
         loss='sparse_categorical_crossentropy',
-        metrics=['accuracy']
+        metrics=['accuracy'],
+        jit_compile=True
     )
     
     return model
 
-def train_model(json_file, output_dir='model', epochs=100, batch_size=32):
+def train_model(json_file, output_dir='model', epochs=100, batch_size=32, precision='float32',
+                backend='keras'):
     """
     Train the gesture classification model.
     
     Args:
-        json_file: Path to JSON file with gesture data
+        json_file: Path to JSON/JSONL file with gesture data
         output_dir: Directory to save the trained model
         epochs: Number of training epochs
         batch_size: Batch size for training
+        precision: Keras dtype policy, one of PRECISION_POLICIES
+        backend: "keras" for model.fit, or "numba" to train with the Numba
+            kernels in train_numba.py (no dropout, history is None)
     """
     # Load data
     X, y = load_data(json_file)
     
-    # Encode labels
+    # Encode labels with the fixed class order
+    unknown = set(np.unique(y)) - CLASS_TO_INDEX.keys()
+    if unknown:
+        raise ValueError(f"Unknown labels in {json_file}: {sorted(unknown)} (expected {CLASSES})")
+    y_encoded = np.fromiter((CLASS_TO_INDEX[label] for label in y), dtype=np.int32, count=len(y))
+    
+    # Encoder with the same classes, for callers that want inverse_transform
     label_encoder = LabelEncoder()
-    y_encoded = label_encoder.fit_transform(y)
+    label_encoder.classes_ = np.array(CLASSES)
     
     print(f"\nLabel mapping:")
     for i, label in enumerate(label_encoder.classes_):
@@ -97,25 +171,62 @@ def train_model(json_file, output_dir='model', epochs=100, batch_size=32):
     print(f"\nTraining set: {len(X_train)} samples")
     print(f"Test set: {len(X_test)} samples")
     
+    # Build input pipelines once; cached tensors are reshuffled each epoch
+    train_ds = (
+        tf.data.Dataset.from_tensor_slices((X_train, y_train))
+        .cache()
+        .shuffle(len(X_train), seed=42)
+        .batch(batch_size)
+        .prefetch(tf.data.AUTOTUNE)
+    )
+    test_ds = (
+        tf.data.Dataset.from_tensor_slices((X_test, y_test))
+        .cache()
+        .batch(batch_size)
+        .prefetch(tf.data.AUTOTUNE)
+    )
+    
+    if backend == 'numba':
+        try:
+            from train_numba import train_numba
+        except ImportError:
+            print("\n⚠️  numba not installed, falling back to the keras backend:")
+            print("   pip install numba")
+            backend = 'keras'
+        else:
+            # Weights are float32, so the model is built without mixed precision
+            precision = 'float32'
+    
     # Create model
-    model = create_model(X.shape[1], len(label_encoder.classes_))
+    model = create_model(X.shape[1], len(label_encoder.classes_), precision)
     
     print("\nModel architecture:")
     model.summary()
     
     # Train model
-    print("\nTraining model...")
-    history = model.fit(
-        X_train, y_train,
-        batch_size=batch_size,
-        epochs=epochs,
-        validation_data=(X_test, y_test),
-        verbose=1
-    )
+    print(f"\nTraining model ({backend} backend)...")
+    if backend == 'numba':
+        dense_layers = [layer for layer in model.layers if isinstance(layer, tf.keras.layers.Dense)]
+        weights = train_numba(
+            X_train, y_train, len(label_encoder.classes_),
+            epochs=epochs,
+            batch_size=batch_size,
+            hidden_sizes=[layer.units for layer in dense_layers[:-1]]
+        )
+        # Same layer order as get_weights(), so the save/export path below is unchanged
+        model.set_weights(weights)
+        history = None
+    else:
+        history = model.fit(
+            train_ds,
+            epochs=epochs,
+            validation_data=test_ds,
+            verbose=1
+        )
     
     # Evaluate
     print("\nEvaluating on test set...")
-    test_loss, test_accuracy = model.evaluate(X_test, y_test, verbose=0)
+    test_loss, test_accuracy = model.evaluate(test_ds, verbose=0)
     print(f"Test accuracy: {test_accuracy:.4f}")
     
     # Save model
@@ -155,7 +266,7 @@ if __name__ == "__main__":
         "--data",
         type=str,
         default="gesture-data-1766151397649.json",
-        help="Path to JSON file with gesture data"
+        help="Path to JSON/JSONL file with gesture data"
     )
     parser.add_argument(
         "--output",
@@ -175,6 +286,20 @@ if __name__ == "__main__":
         default=32,
         help="Batch size for training (default: 32)"
     )
+    parser.add_argument(
+        "--precision",
+        type=str,
+        choices=PRECISION_POLICIES,
+        default="float32",
+        help="Training precision policy; mixed_bfloat16 suits recent CPUs, mixed_float16 GPUs (default: float32)"
+    )
+    parser.add_argument(
+        "--backend",
+        type=str,
+        choices=BACKENDS,
+        default="keras",
+        help="Training backend; numba is much faster for quick sweeps but skips dropout (default: keras)"
+    )
     
     args = parser.parse_args()
     
@@ -182,4 +307,4 @@ if __name__ == "__main__":
         print(f"Error: Data file '{args.data}' not found!")
         exit(1)
     
-    train_model(args.data, args.output, args.epochs, args.batch_size)
+    train_model(args.data, args.output, args.epochs, args.batch_size, args.precision, args.backend)
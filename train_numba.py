@@ -0,0 +1,194 @@
+"""
+Numba training backend for the gesture classifier.
+Trains the same dense network as train_model.create_model without Keras,
+for fast hyperparameter sweeps. Dropout is not applied.
+"""
+
+import numpy as np
+from numba import njit, prange
+
+# Adam hyperparameters (Keras defaults)
+LEARNING_RATE = 0.001
+BETA_1 = 0.9
+BETA_2 = 0.999
+EPSILON = 1e-7
+
+@njit(parallel=True, fastmath=True, cache=True)
+def dense_forward(x, W, b, relu):
+    """Dense layer forward pass: out = x @ W + b, optionally followed by ReLU."""
+    n, d_in = x.shape
+    d_out = W.shape[1]
+    out = np.empty((n, d_out), dtype=np.float32)
+    for i in prange(n):
+        for j in range(d_out):
+            out[i, j] = b[j]
+        for k in range(d_in):
+            xk = x[i, k]
+            for j in range(d_out):
+                out[i, j] += xk * W[k, j]
+        if relu:
+            for j in range(d_out):
+                if out[i, j] < 0.0:
+                    out[i, j] = 0.0
+    return out
+
+@njit(parallel=True, fastmath=True, cache=True)
+def dense_backward(x, W, dout, dW, db, relu_input):
+    """
+    Dense layer backward pass.
+    
+    Writes the weight and bias gradients into dW and db and returns the
+    gradient w.r.t. x, masked by ReLU if x is a ReLU output.
+    """
+    n, d_in = x.shape
+    d_out = W.shape[1]
+    
+    for k in prange(d_in):
+        for j in range(d_out):
+            dW[k, j] = 0.0
+        for i in range(n):
+            xk = x[i, k]
+            for j in range(d_out):
+                dW[k, j] += xk * dout[i, j]
+    
+    for j in prange(d_out):
+        s = 0.0
+        for i in range(n):
+            s += dout[i, j]
+        db[j] = s
+    
+    dx = np.empty((n, d_in), dtype=np.float32)
+    for i in prange(n):
+        for k in range(d_in):
+            if relu_input and x[i, k] <= 0.0:
+                dx[i, k] = 0.0
+            else:
+                s = 0.0
+                for j in range(d_out):
+                    s += dout[i, j] * W[k, j]
+                dx[i, k] = s
+    return dx
+
+@njit(parallel=True, fastmath=True, cache=True)
+def softmax_ce_grad(logits, y):
+    """Mean softmax cross-entropy over the batch; returns (loss, dlogits, correct)."""
+    n, c = logits.shape
+    dlogits = np.empty_like(logits)
+    loss = 0.0
+    correct = 0
+    for i in prange(n):
+        best = 0
+        m = logits[i, 0]
+        for j in range(1, c):
+            if logits[i, j] > m:
+                m = logits[i, j]
+                best = j
+        total = 0.0
+        for j in range(c):
+            e = np.exp(logits[i, j] - m)
+            dlogits[i, j] = e
+            total += e
+        for j in range(c):
+            dlogits[i, j] /= total
+        loss += -np.log(max(dlogits[i, y[i]], 1e-12))
+        dlogits[i, y[i]] -= 1.0
+        for j in range(c):
+            dlogits[i, j] /= n
+        if best == y[i]:
+            correct += 1
+    return loss / n, dlogits, correct
+
+@njit(parallel=True, fastmath=True, cache=True)
+def adam_update(params, grads, m, v, lr, beta_1, beta_2, epsilon, t):
+    """In-place Adam step over the flat parameter vector."""
+    lr_t = lr * np.sqrt(1.0 - beta_2 ** t) / (1.0 - beta_1 ** t)
+    for i in prange(params.size):
+        g = grads[i]
+        m[i] = beta_1 * m[i] + (1.0 - beta_1) * g
+        v[i] = beta_2 * v[i] + (1.0 - beta_2) * g * g
+        params[i] -= lr_t * m[i] / (np.sqrt(v[i]) + epsilon)
+
+def _layer_views(flat, shapes):
+    """Split a flat float32 vector into (W, b) views, one pair per layer."""
+    views = []
+    offset = 0
+    for d_in, d_out in shapes:
+        W = flat[offset:offset + d_in * d_out].reshape(d_in, d_out)
+        offset += d_in * d_out
+        b = flat[offset:offset + d_out]
+        offset += d_out
+        views.append((W, b))
+    return views
+
+def _forward(x, layers):
+    """Forward pass; returns the ReLU activations of every layer and the logits."""
+    activations = [x]
+    for i, (W, b) in enumerate(layers):
+        activations.append(dense_forward(activations[-1], W, b, i < len(layers) - 1))
+    return activations
+
+def train_numba(X_train, y_train, num_classes, epochs=100, batch_size=32,
+                hidden_sizes=(128, 64, 32), seed=42):
+    """
+    Train the dense classifier with Numba-compiled kernels.
+    
+    Args:
+        X_train: float32 array of shape (N, 63)
+        y_train: int array of class indices
+        num_classes: Number of output classes
+        epochs: Number of training epochs
+        batch_size: Batch size for training
+        hidden_sizes: Hidden layer widths, as in create_model
+        seed: Random seed for initialization and shuffling
+    
+    Returns:
+        List of weight arrays in Keras get_weights() order (kernel, bias per layer)
+    """
+    rng = np.random.default_rng(seed)
+    X_train = np.ascontiguousarray(X_train, dtype=np.float32)
+    y_train = np.ascontiguousarray(y_train, dtype=np.int64)
+    
+    sizes = (X_train.shape[1], *hidden_sizes, num_classes)
+    shapes = list(zip(sizes[:-1], sizes[1:]))
+    num_params = sum(d_in * d_out + d_out for d_in, d_out in shapes)
+    
+    # All weights and gradients live in single flat buffers, so Adam is one kernel
+    params = np.zeros(num_params, dtype=np.float32)
+    grads = np.zeros(num_params, dtype=np.float32)
+    m = np.zeros(num_params, dtype=np.float32)
+    v = np.zeros(num_params, dtype=np.float32)
+    layers = _layer_views(params, shapes)
+    grad_layers = _layer_views(grads, shapes)
+    
+    # Glorot uniform kernels and zero biases, like Keras Dense
+    for W, _ in layers:
+        limit = np.sqrt(6.0 / (W.shape[0] + W.shape[1]))
+        W[:] = rng.uniform(-limit, limit, W.shape)
+    
+    step = 0
+    n = len(X_train)
+    for epoch in range(epochs):
+        order = rng.permutation(n)
+        epoch_loss = 0.0
+        epoch_correct = 0
+        
+        for start in range(0, n, batch_size):
+            idx = order[start:start + batch_size]
+            xb = X_train[idx]
+            yb = y_train[idx]
+            
+            activations = _forward(xb, layers)
+            loss, dout, correct = softmax_ce_grad(activations[-1], yb)
+            for i in range(len(layers) - 1, -1, -1):
+                W, _ = layers[i]
+                dW, db = grad_layers[i]
+                dout = dense_backward(activations[i], W, dout, dW, db, i > 0)
+            
+            step += 1
+            adam_update(params, grads, m, v, LEARNING_RATE, BETA_1, BETA_2, EPSILON, step)
+            epoch_loss += loss * len(idx)
+            epoch_correct += correct
+        
+        print(f"Epoch {epoch + 1}/{epochs} - loss: {epoch_loss / n:.4f} - accuracy: {epoch_correct / n:.4f}")
+    
+    return [array.copy() for layer in layers for array in layer]